@@ -20,13 +20,30 @@ Node layout expected (created by aptos_make_node_configs.sh):
   - ${BASE_DIR}/nodes/v0/node.yaml
   - ${BASE_DIR}/nodes/v0/genesis/validator-identity.yaml
   - ${BASE_DIR}/nodes/v1/...
+
+Caches written under ${BASE_DIR} (safe to delete, rebuilt on the next run):
+  - node_info.cache.json : account/pubkey per node, valid while the
+                           validator-identity.yaml mtimes are unchanged
+  - .pubkey_cache.json   : derived network pubkeys of the current identities
 """
 
+import functools
+import hashlib
 import os
+import re
 import sys
 from pathlib import Path
+from typing import Optional
+import orjson
 import yaml
-from cryptography.hazmat.primitives.asymmetric.x25519 import X25519PrivateKey
+from nacl.bindings import crypto_scalarmult_base
+
+# Prefer the libyaml C loader/dumper; fall back to pure Python if PyYAML
+# was built without libyaml
+try:
+    from yaml import CSafeLoader as SafeLoader, CSafeDumper as SafeDumper
+except ImportError:
+    from yaml import SafeLoader, SafeDumper
 
 # -----------------------------
 # Resolve env + paths
@@ -43,6 +60,10 @@ else:
     APTOS_YML = ROOT / "configs" / "aptos.yml"
 
 NODES_DIR = BASE_DIR / "nodes"
+# Derived network pubkeys, keyed by sha256(private key bytes)
+PUBKEY_CACHE_FILE = BASE_DIR / ".pubkey_cache.json"
+# node_info from the last run + the identity file mtimes it was built from
+NODE_INFO_CACHE_FILE = BASE_DIR / "node_info.cache.json"
 
 
 def fatal(msg: str, code: int = 1):
@@ -57,7 +78,7 @@ if not APTOS_YML.exists():
     fatal(f"dsTest config not found: {APTOS_YML}")
 
 with open(str(APTOS_YML), "r") as f:
-    doc = yaml.safe_load(f) or {}
+    doc = yaml.load(f, Loader=SafeLoader) or {}
 
 base_interceptor = int(doc.get("NetworkConfig", {}).get("BaseInterceptorPort", 10000))
 num_replicas = int(doc.get("ProcessConfig", {}).get("NumReplicas", 4))
@@ -74,22 +95,58 @@ node_dirs = sorted([p for p in NODES_DIR.iterdir() if p.is_dir() and p.name.star
 if not node_dirs:
     fatal(f"no node dirs found under {NODES_DIR} (expected v0, v1, ...)")
 
+# -----------------------------
+# Cache helpers
+# -----------------------------
+def load_json_cache(path: Path) -> dict:
+    try:
+        with open(path, "rb") as f:
+            cache = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_json_cache(path: Path, cache: dict) -> None:
+    try:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps(cache))
+    except OSError as e:
+        print(f"WARNING: could not write {path}: {e}", file=sys.stderr)
+
+
 # -----------------------------
 # Key derivation helpers
 # -----------------------------
+# Identities don't change between reruns (e.g. in CI), so derived pubkeys are
+# persisted in PUBKEY_CACHE_FILE and only new keys go through X25519
+# (libsodium's crypto_scalarmult_base, i.e. scalar * base point).
+pubkey_cache = load_json_cache(PUBKEY_CACHE_FILE)
+# Digests of the keys seen in this run; only these are saved back, so keys
+# from earlier genesis runs drop out of the cache
+used_pubkeys: dict = {}
+
+
+@functools.lru_cache(maxsize=None)
 def derive_public_key_hex(private_key_hex: str) -> str:
     if private_key_hex.startswith("0x") or private_key_hex.startswith("0X"):
         private_key_hex = private_key_hex[2:]
     private_bytes = bytes.fromhex(private_key_hex)
-    private_key = X25519PrivateKey.from_private_bytes(private_bytes)
-    public_key = private_key.public_key()
-    return public_key.public_bytes_raw().hex()
+
+    digest = hashlib.sha256(private_bytes).hexdigest()
+    cached = pubkey_cache.get(digest)
+    if isinstance(cached, str):
+        public_key_hex = cached
+    else:
+        public_key_hex = crypto_scalarmult_base(private_bytes).hex()
+    used_pubkeys[digest] = public_key_hex
+    return public_key_hex
 
 
 # -----------------------------
 # Read validator identities
 # -----------------------------
-node_info = {}
+identity_files = {}
 for nd in node_dirs:
     # v0 -> 0
     try:
@@ -100,23 +157,61 @@ for nd in node_dirs:
     id_file = nd / "genesis" / "validator-identity.yaml"
     if not id_file.exists():
         fatal(f"{nd} missing genesis/validator-identity.yaml")
+    identity_files[idx] = id_file
+
+
+def load_cached_node_info(mtimes: dict):
+    """
+    Return node_info from NODE_INFO_CACHE_FILE if it was built from identity
+    files with exactly these mtimes, else None.
+    """
+    cache = load_json_cache(NODE_INFO_CACHE_FILE)
+    cached = cache.get("node_info")
+    if cache.get("mtimes") != mtimes or not isinstance(cached, dict) or cached.keys() != mtimes.keys():
+        return None
+    for info in cached.values():
+        if not isinstance(info, dict) or not isinstance(info.get("account_address"), str) \
+                or not isinstance(info.get("network_public_key"), str):
+            return None
+    return {int(idx): info for idx, info in cached.items()}
+
+
+# If no identity changed since the last run, skip YAML parsing and key derivation
+identity_mtimes = {str(idx): f.stat().st_mtime_ns for idx, f in identity_files.items()}
+node_info = load_cached_node_info(identity_mtimes)
+
+if node_info is None:
+    node_info = {}
+    for idx, id_file in identity_files.items():
+        with open(id_file, "r") as f:
+            data = yaml.load(f, Loader=SafeLoader) or {}
+
+        account_address = data.get("account_address", "")
+        network_private_key = data.get("network_private_key", "")
 
-    with open(id_file, "r") as f:
-        data = yaml.safe_load(f) or {}
+        if not account_address or not network_private_key:
+            fatal(f"missing fields in {id_file}")
 
-    account_address = data.get("account_address", "")
-    network_private_key = data.get("network_private_key", "")
+        if account_address.startswith("0x"):
+            account_address = account_address[2:]
 
-    if not account_address or not network_private_key:
-        fatal(f"missing fields in {id_file}")
+        network_public_key = derive_public_key_hex(network_private_key)
+        node_info[idx] = {"account_address": account_address, "network_public_key": network_public_key}
 
-    if account_address.startswith("0x"):
-        account_address = account_address[2:]
+    if used_pubkeys != pubkey_cache:
+        save_json_cache(PUBKEY_CACHE_FILE, used_pubkeys)
 
-    network_public_key = derive_public_key_hex(network_private_key)
-    node_info[idx] = {"account_address": account_address, "network_public_key": network_public_key}
-    print(f"Node {idx}: account={account_address[:16]}..., pubkey={network_public_key[:16]}...")
+    save_json_cache(NODE_INFO_CACHE_FILE, {
+        "mtimes": identity_mtimes,
+        "node_info": {str(idx): info for idx, info in node_info.items()},
+    })
 
+for idx, info in node_info.items():
+    print(f"Node {idx}: account={info['account_address'][:16]}..., pubkey={info['network_public_key'][:16]}...")
+
+# The 0x-prefixed pubkey is the same for every node that seeds this peer
+for info in node_info.values():
+    info["pubkey_0x"] = "0x" + info["network_public_key"]
 
 # -----------------------------
 # Interceptor port mapping
@@ -127,6 +222,159 @@ def get_interceptor_port(sender: int, receiver: int) -> int:
     return base_interceptor + id_
 
 
+# -----------------------------
+# node.yaml seeds patching
+# -----------------------------
+# node.yaml is patched as text: only the validator_network block is touched,
+# the rest of the document is not re-emitted (it is only re-parsed when a
+# missing validator_network block is appended).
+#
+# Matches a block-style top-level 'validator_network:' mapping and captures
+# its body (indented, blank or column-0 comment lines).
+VALIDATOR_NETWORK_RE = re.compile(
+    r"^validator_network:[ \t]*(?:#[^\n]*)?\n((?:[ \t]+[^\n]*\n|#[^\n]*\n|\n)*)",
+    re.MULTILINE,
+)
+SEED_KEYS = ("seeds", "seed_addrs")
+
+
+def render_seeds_yaml(seeds: dict, indent: str) -> str:
+    # Scalars are single-quoted: hex peer ids / keys would otherwise be read
+    # back as ints by YAML
+    if not seeds:
+        return f"{indent}seeds: {{}}\n"
+    lines = [f"{indent}seeds:"]
+    for peer_id, seed in seeds.items():
+        lines.append(f"{indent}  '{peer_id}':")
+        lines.append(f"{indent}    addresses:")
+        lines.extend(f"{indent}    - '{addr}'" for addr in seed["addresses"])
+        lines.append(f"{indent}    keys:")
+        lines.extend(f"{indent}    - '{key}'" for key in seed["keys"])
+        lines.append(f"{indent}    role: {seed['role']}")
+    return "\n".join(lines) + "\n"
+
+
+def load_validator_network(body: str) -> Optional[dict]:
+    # Parse just the validator_network block; None if it isn't a mapping
+    try:
+        doc = yaml.load("validator_network:\n" + body, Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+    vnet = doc.get("validator_network") if isinstance(doc, dict) else None
+    if vnet is None and not body.strip():
+        return {}
+    return vnet if isinstance(vnet, dict) else None
+
+
+def append_seeds(text: str, seeds: dict) -> Optional[str]:
+    # No validator_network yet: append a block, but only if the document
+    # still loads with every other top-level key intact (flow-style or
+    # multi-document files don't)
+    patched = text + "validator_network:\n" + render_seeds_yaml(seeds, "  ")
+    try:
+        old_doc = yaml.load(text, Loader=SafeLoader)
+        new_doc = yaml.load(patched, Loader=SafeLoader)
+    except yaml.YAMLError:
+        return None
+    if old_doc is None:
+        old_doc = {}
+    if not isinstance(old_doc, dict) or not isinstance(new_doc, dict):
+        return None
+    if new_doc.pop("validator_network", None) != {"seeds": seeds} or new_doc != old_doc:
+        return None
+    return patched
+
+
+def splice_seeds(text: str, seeds: dict) -> Optional[str]:
+    """
+    Replace validator_network.seeds (and drop seed_addrs) in node.yaml text.
+    Returns None if validator_network is not a block mapping we can safely
+    edit (comments inside it, unusual indentation, ...), or if the spliced
+    block doesn't parse back to the expected mapping.
+    """
+    if text and not text.endswith("\n"):
+        text += "\n"
+
+    m = VALIDATOR_NETWORK_RE.search(text)
+    if m is None:
+        if "validator_network" in text:
+            # e.g. flow style 'validator_network: {...}' or a quoted key
+            return None
+        return append_seeds(text, seeds)
+
+    body = m.group(1).splitlines(keepends=True)
+    # Trailing blank lines and column-0 comments separate the block from the
+    # next key, keep them last
+    tail: list[str] = []
+    while body and (not body[-1].strip() or body[-1].startswith("#")):
+        tail.insert(0, body.pop())
+
+    # Comments can't be attributed to a key reliably, leave them to the YAML library
+    if any(line.lstrip().startswith("#") for line in body):
+        return None
+
+    child_lines = [line for line in body if line.strip()]
+    if not child_lines:
+        indent = "  "
+    else:
+        first = child_lines[0]
+        indent = first[:len(first) - len(first.lstrip())]
+        if indent.strip(" ") or first.lstrip().startswith("-"):
+            # tab indentation / not a mapping, leave it to the YAML library
+            return None
+
+    kept = []
+    keys = []
+    skipping = False
+    for line in body:
+        content = line.lstrip()
+        depth = len(line) - len(content)
+        if content.strip() and depth < len(indent):
+            return None
+        # A new key of validator_network starts at the block indent
+        # ('-' at that indent is a list item of the previous key)
+        if content.strip() and depth == len(indent) and not content.startswith("-"):
+            if ":" not in content:
+                return None
+            key = content.split(":", 1)[0].strip().strip("'\"")
+            skipping = key in SEED_KEYS
+            if not skipping:
+                keys.append(key)
+        if not skipping:
+            kept.append(line)
+
+    if len(set(keys)) != len(keys):
+        return None
+
+    new_body = "".join(kept) + render_seeds_yaml(seeds, indent)
+
+    # Check the spliced block before it is written: same keys as before,
+    # seed_addrs gone, seeds exactly as built
+    old_vnet = load_validator_network("".join(body))
+    new_vnet = load_validator_network(new_body)
+    if old_vnet is None or new_vnet is None:
+        return None
+    if new_vnet.get("seeds") != seeds or "seed_addrs" in new_vnet:
+        return None
+    for key in set(old_vnet) | set(new_vnet):
+        if key not in SEED_KEYS and old_vnet.get(key) != new_vnet.get(key):
+            return None
+
+    return text[:m.start(1)] + new_body + "".join(tail) + text[m.end(1):]
+
+
+def patch_seeds_roundtrip(node_yaml: Path, text: str, seeds: dict) -> str:
+    # Fallback for layouts splice_seeds can't edit: full YAML load + dump
+    cfg = yaml.load(text, Loader=SafeLoader) or {}
+    vnet = cfg.setdefault("validator_network", {})
+    if not isinstance(vnet, dict):
+        fatal(f"validator_network is not a mapping in {node_yaml}")
+
+    vnet.pop("seed_addrs", None)
+    vnet["seeds"] = seeds
+    return yaml.dump(cfg, Dumper=SafeDumper, default_flow_style=False, sort_keys=False)
+
+
 # -----------------------------
 # Patch node.yaml seeds
 # -----------------------------
@@ -141,7 +389,7 @@ for nd in node_dirs:
         fatal(f"Missing {node_yaml}")
 
     with open(node_yaml, "r") as f:
-        cfg = yaml.safe_load(f) or {}
+        text = f.read()
 
     # Build seeds with role: Validator (NOT seed_addrs which defaults to ValidatorFullNode)
     seeds = {}
@@ -149,25 +397,22 @@ for nd in node_dirs:
         if j == idx:
             continue
         port = get_interceptor_port(idx, j)
-        pubkey = info["network_public_key"]
-        addr = f"/ip4/127.0.0.1/tcp/{port}/noise-ik/0x{pubkey}/handshake/0"
+        pubkey_0x = info["pubkey_0x"]
+        addr = f"/ip4/127.0.0.1/tcp/{port}/noise-ik/{pubkey_0x}/handshake/0"
         peer_id = info["account_address"]
         seeds[peer_id] = {
             "addresses": [addr],
-            "keys": [f"0x{pubkey}"],
+            "keys": [pubkey_0x],
             "role": "Validator",
         }
 
     # Remove old seed_addrs if present, set seeds instead
-    vnet = cfg.setdefault("validator_network", {})
-    if not isinstance(vnet, dict):
-        fatal(f"validator_network is not a mapping in {node_yaml}")
-
-    vnet.pop("seed_addrs", None)
-    vnet["seeds"] = seeds
+    patched = splice_seeds(text, seeds)
+    if patched is None:
+        patched = patch_seeds_roundtrip(node_yaml, text, seeds)
 
     with open(node_yaml, "w") as f:
-        yaml.dump(cfg, f, default_flow_style=False, sort_keys=False)
+        f.write(patched)
 
     print(f"Updated {nd.name} with seeds (role=Validator): {list(seeds.keys())}")
 
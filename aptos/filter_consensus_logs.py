@@ -1,11 +1,17 @@
 #!/usr/bin/env python3
 import argparse
+import functools
 import json
+import mmap
+import multiprocessing
 import re
+import shutil
 import sys
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional, Iterable, Tuple
+from typing import Dict, Any, Optional, Iterable, Tuple, Union
+
+import orjson
 
 # --------------------------------------------------------------------
 # Step 0: Define parsing and filtering primitives (regex + keywords)
@@ -25,63 +31,150 @@ from typing import Dict, Any, Optional, Iterable, Tuple
 #   msg         -> remaining message content
 #
 # This lets us treat logs as structured events.
+#
+# Log files are scanned as raw bytes (see process_log_file), so this is a
+# bytes pattern; only the fields of kept lines are decoded to str.
+#
+# target is matched greedily: ':<digits>' must be followed by whitespace,
+# so only the last ':' of the token can end it, which is exactly where
+# backtracking from the end of the token stops. This gives the same split
+# as a lazy \S+? without re-trying the rest of the pattern at every char.
 # ------------------------------------------------------------------
 
 LINE_RE = re.compile(
-    r"^(?P<ts>\d{4}-\d{2}-\d{2}T[0-9:.]+Z)\s+"
-    r"\[(?P<thr>[^\]]+)\]\s+"
-    r"(?P<level>[A-Z]+)\s+"
-    r"(?P<target>\S+?):(?P<line>\d+)\s+"
-    r"(?P<msg>.*)$"
+    rb"^(?P<ts>\d{4}-\d{2}-\d{2}T[0-9:.]+Z)\s+"
+    rb"\[(?P<thr>[^\]]+)\]\s+"
+    rb"(?P<level>[A-Z]+)\s+"
+    rb"(?P<target>\S+):(?P<line>\d+)\s+"
+    rb"(?P<msg>.*)$"
 )
 
 # ------------------------------------------------------------------
-# JSON_RE:
+# Embedded JSON:
 # Some Aptos log messages embed structured JSON payloads, e.g.
 #   {"event":"NewRound","epoch":2,"round":51}
 #
-# This regex extracts the first {...} block so we can json.loads()
-# it and access fields like event, epoch, round programmatically.
+# parse_line() takes the outermost {...} block (first '{' to last '}')
+# with str.find/rfind, so we can orjson.loads() it and access fields like
+# event, epoch, round programmatically. Most lines carry no '{' at all,
+# so this is cheaper than a regex search.
+#
+# orjson is stricter than the stdlib json module, so it falls back to json:
+#   - NaN/Infinity are rejected by orjson.loads -> parsed with json.loads
+#     (and written back as null, orjson has no NaN literal)
+#   - integers outside 64 bits come back from orjson.loads as floats ->
+#     blobs with long digit runs are re-parsed with json.loads
+#   - orjson.dumps fails on such integers and on nesting deeper than ~254
+#     levels -> that record is encoded with json.dumps
 # ------------------------------------------------------------------
+# 19+ digits may not fit in an i64/u64, orjson would turn it into a float
+BIG_INT_RE = re.compile(r"\d{19,}")
+
+
+def loads_payload(blob: str) -> Any:
+    try:
+        payload = orjson.loads(blob)
+    except orjson.JSONDecodeError:
+        try:
+            return json.loads(blob)
+        except (ValueError, RecursionError):
+            return None
+    if BIG_INT_RE.search(blob):
+        return json.loads(blob)
+    return payload
 
-JSON_RE = re.compile(r"(\{.*\})")
 
 # ------------------------------------------------------------------
 # We keep a log line if:
 #   - it contains a JSON payload with payload["event"] matching our keywords
 #   - the raw message string contains any of our keywords
+#
+# Keywords are ordered by descending frequency in consensus logs (votes
+# and round changes first, epoch changes last), so that matching lines
+# hit a keyword after only a few substring checks.
 # ------------------------------------------------------------------
 
 EVENT_KEYWORDS = [
-    "NewEpoch", "NewRound", "CommitViaBlock",
-    "Timeout", "RoundTimeout", "ReceiveRoundTimeout",
-    "Vote", "VoteNIL",
-    "Propose", "OptPropose",
-    "ReceiveProposal", "ReceiveOptProposal", "ProcessOptProposal",
-    "ReceiveSyncInfo", "SyncInfo", "ReceiveNewCertificate",
-    "NetworkReceiveProposal", "NetworkReceiveOptProposal", "NetworkReceiveSyncInfo",
-    "Broadcast", "BroadcastOrderVote", "BroadcastRandShareFastPath",
-    "ReceiveOrderVote", "OrderVote", "ReceiveVote",
-    "Signed ledger info", "Receive commit vote", "Receive ordered block",
-    "leader", "Leader", "proposer", "Proposer", "proposer_election", "rotating_proposer",
+    "Vote", "ReceiveVote", "OrderVote", "ReceiveOrderVote", "BroadcastOrderVote", "VoteNIL",
+    "NewRound", "Timeout", "RoundTimeout", "ReceiveRoundTimeout",
+    "Propose", "proposer", "Proposer", "proposer_election", "rotating_proposer",
+    "ReceiveProposal", "NetworkReceiveProposal",
+    "OptPropose", "ReceiveOptProposal", "NetworkReceiveOptProposal", "ProcessOptProposal",
+    "SyncInfo", "ReceiveSyncInfo", "NetworkReceiveSyncInfo",
+    "Broadcast", "BroadcastRandShareFastPath",
+    "leader", "Leader",
+    "Receive ordered block", "Receive commit vote", "Signed ledger info",
+    "CommitViaBlock", "ReceiveNewCertificate",
     "pacemaker", "Pacemaker",
+    "NewEpoch",
 ]
-KW_RE = re.compile("|".join(re.escape(k) for k in EVENT_KEYWORDS))
+
+# ------------------------------------------------------------------
+# PREFILTER_KEYWORDS:
+# Minimal set of literals that covers EVENT_KEYWORDS: any keyword that
+# contains another keyword (e.g. "ReceiveVote" contains "Vote") is implied
+# by the shorter one and can be dropped. EVENT_KEYWORDS order is kept.
+#
+# has_event_keyword() checks them with plain substring tests (C-level scans).
+# It is used both as a prefilter on the raw line, before paying for
+# LINE_RE/JSON, and for the final keep decision on the event / message.
+# Lines with a JSON \u escape skip the prefilter: the keyword may only
+# show up in the decoded "event" value (e.g. "\u0056ote").
+# ------------------------------------------------------------------
+
+PREFILTER_KEYWORDS = tuple(
+    k for k in EVENT_KEYWORDS
+    if not any(o != k and o in k for o in EVENT_KEYWORDS)
+)
+PREFILTER_KEYWORDS_BYTES = tuple(k.encode("utf-8") for k in PREFILTER_KEYWORDS)
+
+def has_event_keyword(text: Union[str, bytes], keywords: Tuple[Any, ...] = PREFILTER_KEYWORDS) -> bool:
+    """
+    'text' is str by default; pass PREFILTER_KEYWORDS_BYTES for bytes.
+    """
+    for k in keywords:
+        if k in text:
+            return True
+    return False
 
 # Infer node id from dsTest stdout_i.log / stderr_i.log filenames
-NODE_FROM_FILENAME_RE = re.compile(r"^(stdout|stderr)_(\d+)\.log$", re.IGNORECASE)
+# (case-insensitive). Called for every file under the run dirs, so it uses
+# plain str checks rather than a regex.
+def node_id_from_filename(name: str) -> Optional[int]:
+    if len(name) < 12 or name[-4:].lower() != ".log" or name[:7].lower() not in ("stdout_", "stderr_"):
+        return None
+    mid = name[7:-4]
+    if mid.isascii() and mid.isdigit():
+        return int(mid)
+    return None
 
 # ------------------------------------------------------------------
 # Helpers for detecting the experiment run directory
 # ------------------------------------------------------------------
+@functools.lru_cache(maxsize=None)
 def looks_like_run_dir(d: Path) -> bool:
     """
     A 'run dir' is any directory that contains stdout_i.log / stderr_i.log files
     somewhere inside (dsTest output structure).
+
+    dsTest writes the logs directly in the run dir, so the tree is scanned
+    breadth-first (top level first) and we stop at the first match.
+    Memoized, since find_run_dirs may ask about the same dir more than once.
     """
-    for f in d.rglob("*"):
-        if f.is_file() and NODE_FROM_FILENAME_RE.match(f.name):
-            return True
+    pending: list[Union[Path, str]] = [d]
+    while pending:
+        subdirs: list[Union[Path, str]] = []
+        for cur in pending:
+            try:
+                with os.scandir(cur) as it:
+                    for e in it:
+                        if node_id_from_filename(e.name) is not None and e.is_file():
+                            return True
+                        if e.is_dir(follow_symlinks=False):
+                            subdirs.append(e.path)
+            except OSError:
+                continue
+        pending = subdirs
     return False
 
 def expected_run_prefix() -> Optional[str]:
@@ -123,41 +216,104 @@ def find_run_dirs(run_id_dir: Path) -> list[Path]:
 
     return []
 
+# Payload fields copied to the top level of each record
+CONSENSUS_FIELDS = ("epoch", "round", "reason", "remote_peer", "block_round", "block_epoch", "block_author")
+
+class Record:
+    """
+    A kept log line (normalized representation).
+    Fixed slots instead of a dict per line; provenance is filled in by
+    encode_record, and to_dict() builds the JSONL object.
+    """
+    # Hand-written rather than @dataclass(slots=True), which needs Python 3.10
+    __slots__ = ("ts", "thread", "level", "target", "line", "msg",
+                 "payload", "event", "source_file", "run_dir", "node")
+
+    def __init__(self, ts: str, thread: str, level: str, target: str, line: int,
+                 msg: str, payload: Any = None, event: Optional[str] = None) -> None:
+        self.ts = ts
+        self.thread = thread
+        self.level = level
+        self.target = target
+        self.line = line
+        self.msg = msg
+        self.payload = payload        # embedded JSON, output as "json"
+        self.event = event
+        self.source_file = ""
+        self.run_dir = ""
+        self.node = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {
+            "ts": self.ts,
+            "thread": self.thread,
+            "level": self.level,
+            "target": self.target,
+            "line": self.line,
+            "msg": self.msg,
+        }
+
+        # Attach JSON payload and convenient extracted fields if available
+        payload = self.payload
+        if payload is not None:
+            out["json"] = payload
+        if self.event is not None:
+            out["event"] = self.event
+
+        # Common fields, important for consensus
+        if isinstance(payload, dict):
+            for k in CONSENSUS_FIELDS:
+                if k in payload:
+                    out[k] = payload[k]
+
+        out["source_file"] = self.source_file
+        out["run_dir"] = self.run_dir
+        out["node"] = self.node
+        return out
+
 # ------------------------------------------------------------------------------
 # Step 1: Parse a single line into a structured record, and decide to keep/drop
 # ------------------------------------------------------------------------------
-def parse_line(line: str) -> Optional[Dict[str, Any]]:
+def parse_line(line: bytes, level_set: Optional[frozenset] = None) -> Optional[Record]:
+    # Cheap keyword prefilter: most lines carry no consensus keyword at all,
+    # and are dropped without ever being decoded. A \u escape may hide a
+    # keyword inside the payload's event, so those lines go through
+    if not has_event_keyword(line, PREFILTER_KEYWORDS_BYTES) and b"\\u" not in line:
+        return None
+
     # Parses the log prefix into ts/thread/level/target/line/msg
-    m = LINE_RE.match(line.rstrip("\n"))
+    m = LINE_RE.match(line.rstrip(b"\r\n"))
     if not m:
         # Not an Aptos formatted line, drop it
         return None
 
-    d = m.groupdict()
-    msg = d["msg"]
+    ts, thr, level_b, target, lineno, msg = m.groups()
+
+    # Optional log-level filtering (INFO/DEBUG/etc), before any JSON work
+    level = level_b.decode("ascii")
+    if level_set and level not in level_set:
+        return None
 
     # Try to extract and parse an embedded JSON payload
-    payload = None
-    jm = JSON_RE.search(msg)
-    if jm:
-        blob = jm.group(1)
-        try:
-            payload = json.loads(blob)
-        except json.JSONDecodeError:
-            payload = None
+    payload: Any = None
+    lb = msg.find(b"{")
+    if lb >= 0:
+        rb = msg.rfind(b"}")
+        if rb > lb:
+            payload = loads_payload(msg[lb:rb + 1].decode("utf-8", "replace"))
 
     # Decide whether to keep this line
     # If payload has an event field, match it against the predefined keywords
     # Else, match the raw message text
     keep = False
-    event = None
+    event: Any = None
     
-    if isinstance(payload, dict) and "event" in payload:
+    if isinstance(payload, dict):
         event = payload.get("event")
-        if isinstance(event, str) and KW_RE.search(event):
+        if isinstance(event, str) and has_event_keyword(event):
             keep = True
 
-    if not keep and KW_RE.search(msg):
+    if not keep and has_event_keyword(msg, PREFILTER_KEYWORDS_BYTES):
         keep = True
 
     if not keep:
@@ -165,78 +321,147 @@ def parse_line(line: str) -> Optional[Dict[str, Any]]:
         return None
 
     # Build a structured output record (normalized representation)
-    out: Dict[str, Any] = {
-        "ts": d["ts"],
-        "thread": d["thr"],
-        "level": d["level"],
-        "target": d["target"],
-        "line": int(d["line"]),
-        "msg": msg,
-    }
-
-    # Attach JSON payload and convenient extracted fields if available
-    if payload is not None:
-        out["json"] = payload
-        if event is None and isinstance(payload, dict):
-            event = payload.get("event")
-    if isinstance(event, str):
-        out["event"] = event
-
-    # Common fields, important for consensus
-    if isinstance(payload, dict):
-        for k in ("epoch", "round", "reason", "remote_peer", "block_round", "block_epoch", "block_author"):
-            if k in payload:
-                out[k] = payload[k]
-
-    return out
+    return Record(
+        ts.decode("ascii"),
+        thr.decode("utf-8", "replace"),
+        level,
+        target.decode("utf-8", "replace"),
+        int(lineno),
+        msg.decode("utf-8", "replace"),
+        payload,
+        event if isinstance(event, str) else None,
+    )
 
 # ------------------------------------------------------------------------------
 # Step 2: Discover log files under the run directory (stdout_i.log/stderr_i.log)
 # ------------------------------------------------------------------------------
-def iter_log_files(root: Path) -> Iterable[Tuple[Path, Optional[int]]]:
+def iter_log_files(root: Path) -> Iterable[Tuple[Path, int]]:
     """
       - Recursively walk 'root'
       - Keep only files named stdout_<i>.log or stderr_<i>.log
       - Yield (file_path, node_id)
     """
-    for f in root.rglob("*"):
-        if not f.is_file():
-            continue
-        m = NODE_FROM_FILENAME_RE.match(f.name)
-        if not m:
-            continue
-        node_id = int(m.group(2))
-        yield f, node_id
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for name in sorted(filenames):
+            node_id = node_id_from_filename(name)
+            if node_id is None:
+                continue
+            path = os.path.join(dirpath, name)
+            if os.path.isfile(path):
+                yield Path(path), node_id
 
 # ------------------------------------------------------------------------------
-# Step 3: Write the records (JSONL + pretty log text)
+# Step 3: Encode the records (JSONL + pretty log text)
 # ------------------------------------------------------------------------------
-def write_record(jf, tf, rec: Dict[str, Any], source_file: Path, run_name: str, node_id: int) -> None:
+def encode_record(rec: Record, source_file: str, run_name: str, node_id: int) -> Tuple[bytes, bytes]:
     """
       - Enrich record with provenance (which file, which event scheduler run dir, which node)
-      - Write JSONL
-      - Write pretty text line
+      - Encode JSONL line
+      - Encode pretty text line
     """
     
-    rec = dict(rec)  # copy so we don't mutate the original
-    rec["source_file"] = str(source_file)
-    rec["run_dir"] = run_name
-    rec["node"] = node_id
+    rec.source_file = source_file
+    rec.run_dir = run_name
+    rec.node = node_id
 
     # JSONL output (one JSON object per line)
-    jf.write(json.dumps(rec, ensure_ascii=False) + "\n")
+    obj = rec.to_dict()
+    try:
+        jline = orjson.dumps(obj, option=orjson.OPT_APPEND_NEWLINE)
+    except orjson.JSONEncodeError:
+        # Big ints / deep nesting, see "Embedded JSON" above
+        jline = (json.dumps(obj, ensure_ascii=False, separators=(",", ":")) + "\n").encode("utf-8")
 
     # Use whole text:
-    # ev = rec.get("event") or ""
-    # tf.write(f'{rec["ts"]} [node{node_id}] [{rec["thread"]}] {rec["level"]} {ev} {rec["msg"]}\n')
+    # ev = rec.event or ""
+    # tline = f'{rec.ts} [node{node_id}] [{rec.thread}] {rec.level} {ev} {rec.msg}\n'
     # Pretty text: timestamp + original message only
-    tf.write(f'{rec["ts"]} {rec["msg"]}\n')
+    tline = f'{rec.ts} {rec.msg}\n'.encode("utf-8")
+
+    return jline, tline
+
+# ------------------------------------------------------------------------------
+# Step 4: Filter one log file (runs in a worker process)
+# ------------------------------------------------------------------------------
+def process_log_file(task: Tuple[Path, int, Optional[frozenset], str]) -> Tuple[int, int, int, bytes, bytes]:
+    """
+    Parse + filter a single stdout_i.log / stderr_i.log file.
+    Each file is independent, so files are spread across a process pool.
+
+    Each kept record is encoded once; the lines are joined into one JSONL
+    blob and one text blob, which the writer appends to the per-node outputs.
+
+    Returns (node_id, scanned_lines, kept_lines, jsonl_blob, text_blob)
+    """
+    f, node_id, level_set, run_name = task
+    source_file = str(f)
+
+    scanned = 0
+    jlines: list[bytes] = []
+    tlines: list[bytes] = []
+
+    try:
+        with f.open("rb") as fh:
+            # mmap can't map an empty file
+            if os.fstat(fh.fileno()).st_size == 0:
+                return node_id, scanned, 0, b"", b""
+            # Iterate raw lines straight from the page cache; lines are only
+            # decoded once parse_line decides to keep them
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for line in iter(mm.readline, b""):
+                    scanned += 1
+                
+                    # Parse + filter by log level and consensus relevance
+                    rec = parse_line(line, level_set)
+                    if rec is None:
+                        continue
+                
+                    jline, tline = encode_record(rec, source_file, run_name, node_id)
+                    jlines.append(jline)
+                    tlines.append(tline)
+    except OSError:
+        pass
+
+    return node_id, scanned, len(jlines), b"".join(jlines), b"".join(tlines)
+
+# Output files are written in large batches (one write() per log file),
+# so give them a big buffer to keep the number of write(2) calls low
+OUTPUT_BUFFER_SIZE = 1 << 20  # 1 MiB
+
+def concat_files(dst: Path, srcs: list[Path]) -> None:
+    """
+    Write the concatenation of 'srcs' to 'dst'.
+    Data is copied in-kernel with os.sendfile where the OS allows a regular
+    file as target (Linux), otherwise through a userspace buffer.
+    """
+    # Unbuffered, so sendfile and the copyfileobj fallback share the fd offset
+    with dst.open("wb", buffering=0) as out:
+        for src in srcs:
+            with src.open("rb") as inp:
+                size = os.fstat(inp.fileno()).st_size
+                offset = 0
+                try:
+                    while offset < size:
+                        sent = os.sendfile(out.fileno(), inp.fileno(), offset, size - offset)
+                        if sent == 0:
+                            break
+                        offset += sent
+                except (AttributeError, OSError):
+                    # No os.sendfile, or only sockets as target (macOS)
+                    inp.seek(offset)
+                    shutil.copyfileobj(inp, out, OUTPUT_BUFFER_SIZE)
 
 # ------------------------------------------------------------------------------------
-# Step 4: Filter one scheduler-iteration-run directory (per node outputs and combined outputs)
+# Step 5: Filter one scheduler-iteration-run directory (per node outputs and combined outputs)
 # ------------------------------------------------------------------------------------
-def filter_one_run_dir(run_dir: Path, out_dir: Path, level_set: Optional[set]) -> Tuple[int, int]:
+def filter_one_run_dir(run_dir: Path, out_dir: Path, level_set: Optional[frozenset], pool=None) -> Tuple[int, int]:
     """
+    Log files are parsed by 'pool' (or in-process if None), results are
+    written here by a single writer, in file order, to the per-node outputs.
+    The combined outputs are then the per-node outputs concatenated in node
+    order, so records are never written twice from Python.
+
     Returns (scanned_lines, kept_lines)
     """
     run_name = run_dir.name  # e.g. aptos-localnet_pct_0
@@ -247,51 +472,41 @@ def filter_one_run_dir(run_dir: Path, out_dir: Path, level_set: Optional[set]) -
     
     def get_writers(node_id: int):
         if node_id not in writers:
-            jf = (out_dir / f"node{node_id}.jsonl").open("w", encoding="utf-8")
-            tf = (out_dir / f"node{node_id}.log").open("w", encoding="utf-8")
+            jf = (out_dir / f"node{node_id}.jsonl").open("wb", buffering=OUTPUT_BUFFER_SIZE)
+            tf = (out_dir / f"node{node_id}.log").open("wb", buffering=OUTPUT_BUFFER_SIZE)
             writers[node_id] = (jf, tf)
         return writers[node_id]
 
-    # Also create combined outputs across all nodes
-    all_jf = (out_dir / "all_nodes.jsonl").open("w", encoding="utf-8")
-    all_tf = (out_dir / "all_nodes.log").open("w", encoding="utf-8")
-
     scanned = 0
     kept = 0
 
-    # Iterate log files and stream lines
-    for f, node_id in iter_log_files(run_dir):
-        try:
-            with f.open("r", encoding="utf-8", errors="replace") as fh:
-                for line in fh:
-                    scanned += 1
-                    
-                    # Parse + filter by consensus relevance
-                    rec = parse_line(line)
-                    if rec is None:
-                        continue
-                    
-                    # Optional log-level filtering (INFO/DEBUG/etc)
-                    if level_set and rec["level"] not in level_set:
-                        continue
-                    
-                    # Write per-node output
-                    node_jf, node_tf = get_writers(node_id)
-                    write_record(node_jf, node_tf, rec, f, run_name, node_id)
-                    
-                    # Write combined output
-                    write_record(all_jf, all_tf, rec, f, run_name, node_id)
-                    
-                    kept += 1
-        except OSError:
+    tasks = [(f, node_id, level_set, run_name) for f, node_id in iter_log_files(run_dir)]
+    if pool is not None:
+        results = pool.imap(process_log_file, tasks, chunksize=1)
+    else:
+        results = map(process_log_file, tasks)
+
+    for node_id, file_scanned, file_kept, jblob, tblob in results:
+        scanned += file_scanned
+        if not file_kept:
             continue
 
+        # Write per-node output
+        node_jf, node_tf = get_writers(node_id)
+        node_jf.write(jblob)
+        node_tf.write(tblob)
+
+        kept += file_kept
+
     # close everything
     for jf, tf in writers.values():
         jf.close()
         tf.close()
-    all_jf.close()
-    all_tf.close()
+
+    # Combined outputs across all nodes
+    nodes = sorted(writers)
+    concat_files(out_dir / "all_nodes.jsonl", [out_dir / f"node{n}.jsonl" for n in nodes])
+    concat_files(out_dir / "all_nodes.log", [out_dir / f"node{n}.log" for n in nodes])
 
     return scanned, kept
 
@@ -302,11 +517,13 @@ def main() -> None:
     ap.add_argument("--levels", default=None,
                     help="Comma-separated levels to keep (e.g. INFO,DEBUG). If unset, keep all.")
     ap.add_argument("--out-subdir", default="filtered", help="Name of folder created inside each scheduler-run dir.")
+    ap.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                    help="Number of worker processes used to parse log files (default: CPU count).")
     args = ap.parse_args()
 
     level_set = None
     if args.levels:
-        level_set = {x.strip().upper() for x in args.levels.split(",") if x.strip()}
+        level_set = frozenset(x.strip().upper() for x in args.levels.split(",") if x.strip())
 
     run_id_dir = Path(args.run_dir)
     if not run_id_dir.is_dir():
@@ -334,18 +551,32 @@ def main() -> None:
     total_scanned = 0
     total_kept = 0
 
-    for rd in run_dirs:
-        out_dir = rd / args.out_subdir
-        scanned, kept = filter_one_run_dir(rd, out_dir, level_set)
+    # One pool shared by all run directories (no pool when --jobs 1)
+    pool = multiprocessing.Pool(args.jobs) if args.jobs > 1 else None
 
-        total_scanned += scanned
-        total_kept += kept
+    try:
+        for rd in run_dirs:
+            out_dir = rd / args.out_subdir
+            scanned, kept = filter_one_run_dir(rd, out_dir, level_set, pool)
+
+            total_scanned += scanned
+            total_kept += kept
+
+            print(
+                f"[{rd.name}] scanned={scanned} kept={kept} -> {out_dir}",
+                file=sys.stderr,
+            )
+    except BaseException:
+        # Worker error or Ctrl-C: don't wait for the queued files to be parsed
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+        raise
+
+    if pool is not None:
+        pool.close()
+        pool.join()
 
-        print(
-            f"[{rd.name}] scanned={scanned} kept={kept} -> {out_dir}",
-            file=sys.stderr,
-        )
-    
     print(f"TOTAL scanned={total_scanned} kept={total_kept}", file=sys.stderr)
 
 